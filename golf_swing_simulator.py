@@ -1,10 +1,209 @@
+import bisect
+import functools
 import json
 import os
+import sys
 import time
 import random
 import math
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 
-def create_simulated_swing_data(num_samples, total_duration_s):
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; the kernel then runs as plain Python
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library encoder
+    orjson = None
+
+@njit(inline='always', fastmath=True)
+def _fast_sin(x):
+    """
+    Polynomial sine for the swing waveforms, valid for x in [-3*pi/2, 3*pi/2].
+
+    The argument is folded into [-pi/2, pi/2] and evaluated with an odd
+    degree-9 polynomial in Horner form (max error ~4e-6, far below the sensor
+    noise). Inside the numba kernel this avoids a libm call per sample.
+    """
+    if x > 0.5 * math.pi:
+        x = math.pi - x
+    elif x < -0.5 * math.pi:
+        x = -math.pi - x
+    x2 = x * x
+    return x * (1.0 + x2 * (-1.0 / 6.0 + x2 * (1.0 / 120.0 + x2 * (-1.0 / 5040.0 + x2 * (1.0 / 362880.0)))))
+
+# Compiled kernels use the polynomial; plain Python is faster with the C math.sin.
+_wave_sin = _fast_sin if HAVE_NUMBA else math.sin
+
+@njit(cache=True, fastmath=True)
+def _fill_swing(t, phase_times, phase_idx, gyro_scale, accel_scale, y_attack_bias, path_bias,
+                launch_multiplier, spike_sigma, spike_idx, noise_accel, noise_gyro,
+                accel_spike_amp, gyro_spike_amp, accel_out, gyro_out):
+    """
+    Fill the preallocated accel/gyro columns for one swing.
+
+    Scalar numerical kernel: compiled with numba when it is installed, plain
+    Python otherwise. All random draws happen in the caller and are passed in
+    as per-sample buffers, so both paths consume the same random stream. They
+    agree to within float32/approximation tolerance rather than bit for bit:
+    the compiled path uses the _fast_sin polynomial (off by up to ~4e-6) and
+    fastmath, the plain path uses math.sin.
+    """
+    t_address, t_backswing_end, t_downswing_end, t_impact, t_finish = phase_times
+    i_address, i_backswing_end, i_impact, i_finish = phase_idx
+    accel_x, accel_y, accel_z = accel_out
+    gyro_x, gyro_y, gyro_z = gyro_out
+    n = len(t)
+
+    # Loop invariants: angular frequency of each phase waveform and the Gaussian
+    # denominator, hoisted so the per-sample loops do no divisions
+    w_back = math.pi / (t_backswing_end - t_address)
+    w_down = math.pi / (t_downswing_end - t_backswing_end)
+    w_follow = math.pi / (t_finish - t_impact)
+    inv_2sig2 = 1.0 / (2.0 * spike_sigma * spike_sigma)
+
+    # Drift + noise everywhere; gravity on Y. accel_scale is applied to every
+    # accel term (including gravity) as it is added.
+    for i in range(n):
+        gyro_x[i] = t[i] * 0.01 + noise_gyro[i]
+        gyro_y[i] = t[i] * 0.02 + noise_gyro[i]
+        gyro_z[i] = t[i] * 0.015 + noise_gyro[i]
+        accel_x[i] = noise_accel[i] * accel_scale
+        accel_y[i] = (-9.8 + noise_accel[i]) * accel_scale
+        accel_z[i] = noise_accel[i] * accel_scale
+
+    # Backswing
+    # One phase waveform per sample, shared by all six axes
+    for i in range(i_address, i_backswing_end):
+        wave = _wave_sin((t[i] - t_address) * w_back)
+        gyro_x[i] += (-15 * gyro_scale) * wave
+        gyro_y[i] += (10 * gyro_scale) * wave
+        gyro_z[i] += (20 * gyro_scale) * wave
+        accel_x[i] += (5 * accel_scale) * wave
+        accel_y[i] += (2 * accel_scale) * wave
+        accel_z[i] += (3 * accel_scale) * wave
+
+    # Downswing: build a vector whose mean dynamic Y component aligns with y_attack_bias.
+    # Forward acceleration dominates the horizontal magnitude; lateral component follows path bias.
+    # accel_factor = sin(progress * pi / 2) is the downswing waveform at half the
+    # phase, and it stays positive, so the horizontal magnitude is linear in it.
+    forward_peak = 14.0
+    lateral_peak = 0.25 * path_bias
+    horizontal_peak = math.sqrt(forward_peak * forward_peak + lateral_peak * lateral_peak)
+    attack_slope = math.tan(math.radians(y_attack_bias))
+    for i in range(i_backswing_end, i_impact):
+        phase = (t[i] - t_backswing_end) * w_down
+        wave = _wave_sin(phase)
+        gyro_x[i] += (30 * gyro_scale) * wave
+        gyro_y[i] += (-40 * gyro_scale) * wave
+        gyro_z[i] += (-50 * gyro_scale) * wave
+
+        accel_factor = _wave_sin(0.5 * phase)
+
+        base_forward = -forward_peak * accel_factor
+        base_lateral = lateral_peak * accel_factor
+
+        horizontal_mag = horizontal_peak * accel_factor
+        vertical_dynamic = horizontal_mag * attack_slope
+
+        accel_x[i] += base_lateral * accel_scale + path_bias * (0.18 + 0.22 * accel_factor)
+        accel_y[i] += vertical_dynamic * accel_scale
+        accel_z[i] += base_forward * accel_scale
+
+    # Follow-through
+    for i in range(i_impact, i_finish):
+        wave = _wave_sin((t[i] - t_impact) * w_follow)
+        gyro_x[i] += (10 * gyro_scale) * wave
+        gyro_y[i] += (15 * gyro_scale) * wave
+        gyro_z[i] += (-10 * gyro_scale) * wave
+        accel_x[i] += (-5 * accel_scale) * wave + path_bias * 0.12
+        accel_y[i] += (3 * accel_scale) * wave
+        accel_z[i] += (5 * accel_scale) * wave
+
+    # Impact spike: the Gaussian is negligible beyond ~5 sigma, so only the
+    # samples in spike_idx (|t - t_impact| < 5 * spike_sigma) are touched.
+    # The jittered spike amplitudes are drawn for that window only.
+    for i in range(spike_idx[0], spike_idx[1]):
+        k = i - spike_idx[0]
+        d = t[i] - t_impact
+        impact_factor = math.exp(-(d * d) * inv_2sig2)
+        gyro_x[i] += 0.3 * gyro_spike_amp[k] * impact_factor + 0.05 * path_bias * impact_factor
+        gyro_y[i] += -0.2 * gyro_spike_amp[k] * impact_factor
+        gyro_z[i] += 0.5 * gyro_spike_amp[k] * impact_factor
+        accel_x[i] += 0.4 * accel_spike_amp[k] * impact_factor
+        accel_y[i] += 1.0 * accel_spike_amp[k] * impact_factor * launch_multiplier
+        accel_z[i] += 0.3 * accel_spike_amp[k] * impact_factor
+
+# Key swing phases in seconds: address, backswing end, downswing end, impact, finish.
+# Adjust these to change the swing characteristics.
+PHASE_TIMES = (0.5, 2.0, 2.5, 2.6, 4.0)
+SPIKE_SIGMA = 0.01
+
+# Sensor columns are float32: the simulated noise is orders of magnitude above
+# float32 resolution, and half-width buffers halve memory traffic. Timestamps
+# stay float64 so sample spacing is not quantized over long recordings.
+SENSOR_TYPECODE = 'f'
+
+@functools.lru_cache(maxsize=8)
+def _precompute_grid(num_samples, total_duration_s):
+    """
+    Timestamps, phase index ranges, impact window and gyro-peak search range
+    for one sampling grid.
+
+    None of these depend on the random swing profile, so they are computed once
+    per (num_samples, total_duration_s) and reused. The returned timestamp array
+    is shared between calls and must not be mutated.
+    """
+    t_address, t_backswing_end, t_downswing_end, t_impact, t_finish = PHASE_TIMES
+
+    # Generate timestamps without NumPy (equivalent to np.linspace(0, total_duration_s, num_samples))
+    if num_samples <= 1:
+        time_stamps = array('d', [0.0])
+    else:
+        dt = total_duration_s / (num_samples - 1)
+        time_stamps = array('d', (i * dt for i in range(num_samples)))
+
+    # Phase index ranges, located once with bisect
+    i_address = bisect.bisect_right(time_stamps, t_address)
+    i_backswing_end = max(i_address, bisect.bisect_left(time_stamps, t_backswing_end))
+    i_impact = max(i_backswing_end, bisect.bisect_left(time_stamps, t_impact))
+    i_finish = max(i_impact, bisect.bisect_left(time_stamps, t_finish))
+
+    # Samples with |t - t_impact| < 5 * SPIKE_SIGMA
+    i_spike_start = bisect.bisect_right(time_stamps, t_impact - 5 * SPIKE_SIGMA)
+    i_spike_end = max(i_spike_start, bisect.bisect_left(time_stamps, t_impact + 5 * SPIKE_SIGMA))
+
+    # The gyro magnitude peaks in the downswing (about 71 * gyro_scale at its
+    # midpoint, against at most ~27 * gyro_scale in any other phase), so the
+    # peak search only needs the downswing through the impact spike. That holds
+    # when the grid covers the downswing midpoint with at least four samples per
+    # downswing; otherwise search everything.
+    t_downswing_mid = 0.5 * (t_backswing_end + t_downswing_end)
+    fine_grid = len(time_stamps) > 1 and time_stamps[1] <= 0.25 * (t_downswing_end - t_backswing_end)
+    if fine_grid and time_stamps[-1] >= t_downswing_mid:
+        peak_idx = (i_backswing_end, max(i_impact, i_spike_end))
+    else:
+        peak_idx = (0, len(time_stamps))
+
+    return (time_stamps, (i_address, i_backswing_end, i_impact, i_finish),
+            (i_spike_start, i_spike_end), peak_idx)
+
+def _uniform_buffer(rng, low, high, n):
+    """Draw n uniform samples in [low, high) into a float32 column using one bound rng.random."""
+    draw = rng.random
+    span = high - low
+    return array(SENSOR_TYPECODE, [low + span * draw() for _ in range(n)])
+
+def create_simulated_swing_data(num_samples, total_duration_s, seed=None):
     """
     Generates synthetic IMU data for a golf swing motion.
     The motion is divided into key phases: address, backswing, downswing, follow-through.
@@ -12,72 +211,65 @@ def create_simulated_swing_data(num_samples, total_duration_s):
     Args:
         num_samples (int): The total number of data points to generate.
         total_duration_s (float): The total duration of the swing in seconds.
+        seed (int, optional): Seed for the swing's random generator; None draws a fresh one.
 
     Returns:
-        tuple: (data, sim_meta). data is a list of dicts with sensor readings; sim_meta describes the chosen profile.
+        tuple: (data, sim_meta). data is (timestamp, accel, gyro) where timestamp is a
+        float64 array and accel/gyro are (x, y, z) tuples of float32 arrays; use
+        _to_columns() for the stored JSON form or _to_records() for per-sample dicts.
+        sim_meta describes the chosen profile.
     """
-    # Simulate a golf swing motion by defining key phases
-    # Times are in seconds. Adjust these to change the swing characteristics.
-    t_address = 0.5
-    t_backswing_end = 2.0
-    t_downswing_end = 2.5
-    t_impact = 2.6
-    t_finish = 4.0
+    # Timestamps and phase/impact index ranges only depend on the sampling grid
+    grid_t, phase_idx, spike_idx, peak_idx = _precompute_grid(num_samples, total_duration_s)
 
-    # Generate timestamps without NumPy (equivalent to np.linspace(0, total_duration_s, num_samples))
-    if num_samples <= 1:
-        time_stamps = [0.0]
-    else:
-        dt = total_duration_s / (num_samples - 1)
-        time_stamps = [i * dt for i in range(num_samples)]
-    data = []
+    rng = random.Random(seed)
 
     # Choose a swing quality profile to create variety
     profiles = ['good', 'okay', 'bad']
-    profile = random.choices(profiles, weights=[0.4, 0.35, 0.25], k=1)[0]
+    profile = rng.choices(profiles, weights=[0.4, 0.35, 0.25], k=1)[0]
 
     if profile == 'good':
-        gyro_scale = random.uniform(1.15, 1.3)
-        accel_scale = random.uniform(1.05, 1.15)
+        gyro_scale = rng.uniform(1.15, 1.3)
+        accel_scale = rng.uniform(1.05, 1.15)
         noise_accel_range = 0.05
         noise_gyro_range = 0.03
-        y_attack_bias = random.uniform(-0.8, -0.4)
-        path_bias = random.choice([-1, 1]) * random.uniform(0.5, 1.2)
-        accel_spike_base = random.uniform(6.0, 8.0)
-        gyro_spike_base = random.uniform(20.0, 24.0)
-        launch_multiplier = random.uniform(1.0, 1.2)
+        y_attack_bias = rng.uniform(-0.8, -0.4)
+        path_bias = rng.choice([-1, 1]) * rng.uniform(0.5, 1.2)
+        accel_spike_base = rng.uniform(6.0, 8.0)
+        gyro_spike_base = rng.uniform(20.0, 24.0)
+        launch_multiplier = rng.uniform(1.0, 1.2)
     elif profile == 'okay':
-        gyro_scale = random.uniform(1.0, 1.15)
-        accel_scale = random.uniform(0.95, 1.05)
+        gyro_scale = rng.uniform(1.0, 1.15)
+        accel_scale = rng.uniform(0.95, 1.05)
         noise_accel_range = 0.10
         noise_gyro_range = 0.05
-        if random.random() < 0.5:
-            y_attack_bias = random.uniform(-0.6, -0.2)
-            launch_multiplier = random.uniform(1.2, 1.5)
+        if rng.random() < 0.5:
+            y_attack_bias = rng.uniform(-0.6, -0.2)
+            launch_multiplier = rng.uniform(1.2, 1.5)
         else:
-            y_attack_bias = random.uniform(-1.8, -1.2)
-            launch_multiplier = random.uniform(0.8, 1.0)
-        path_bias = random.choice([-1, 1]) * random.uniform(1.5, 2.5)
-        accel_spike_base = random.uniform(5.0, 7.0)
-        gyro_spike_base = random.uniform(15.0, 22.0)
+            y_attack_bias = rng.uniform(-1.8, -1.2)
+            launch_multiplier = rng.uniform(0.8, 1.0)
+        path_bias = rng.choice([-1, 1]) * rng.uniform(1.5, 2.5)
+        accel_spike_base = rng.uniform(5.0, 7.0)
+        gyro_spike_base = rng.uniform(15.0, 22.0)
     else:  # bad
-        gyro_scale = random.uniform(0.85, 1.0)
-        accel_scale = random.uniform(0.85, 0.95)
+        gyro_scale = rng.uniform(0.85, 1.0)
+        accel_scale = rng.uniform(0.85, 0.95)
         noise_accel_range = 0.20
         noise_gyro_range = 0.08
-        if random.random() < 0.5:
-            y_attack_bias = random.uniform(0.5, 1.5)
-            launch_multiplier = random.uniform(0.7, 0.9)
+        if rng.random() < 0.5:
+            y_attack_bias = rng.uniform(0.5, 1.5)
+            launch_multiplier = rng.uniform(0.7, 0.9)
         else:
-            y_attack_bias = random.uniform(-2.5, -3.5)
-            launch_multiplier = random.uniform(1.4, 1.8)
-        path_bias = random.choice([-1, 1]) * random.uniform(2.5, 4.0)
-        if random.random() < 0.5:
-            accel_spike_base = random.uniform(3.0, 5.0)
-            gyro_spike_base = random.uniform(10.0, 16.0)
+            y_attack_bias = rng.uniform(-2.5, -3.5)
+            launch_multiplier = rng.uniform(1.4, 1.8)
+        path_bias = rng.choice([-1, 1]) * rng.uniform(2.5, 4.0)
+        if rng.random() < 0.5:
+            accel_spike_base = rng.uniform(3.0, 5.0)
+            gyro_spike_base = rng.uniform(10.0, 16.0)
         else:
-            accel_spike_base = random.uniform(8.0, 12.0)
-            gyro_spike_base = random.uniform(24.0, 32.0)
+            accel_spike_base = rng.uniform(8.0, 12.0)
+            gyro_spike_base = rng.uniform(24.0, 32.0)
 
     sim_meta = {
         'profile': profile,
@@ -90,125 +282,50 @@ def create_simulated_swing_data(num_samples, total_duration_s):
         'launch_multiplier': round(launch_multiplier, 3),
     }
 
-    for i, t in enumerate(time_stamps):
-        drift_x = t * 0.01
-        drift_y = t * 0.02
-        drift_z = t * 0.015
-        
-        noise_accel = random.uniform(-noise_accel_range, noise_accel_range)
-        noise_gyro = random.uniform(-noise_gyro_range, noise_gyro_range)
-
-        spike_sigma = 0.01
-        accel_spike_amp = accel_spike_base * (1.0 + random.uniform(-0.1, 0.1))
-        gyro_spike_amp = gyro_spike_base * (1.0 + random.uniform(-0.1, 0.1))
-        impact_factor = math.exp(-((t - t_impact) ** 2) / (2.0 * spike_sigma ** 2))
-
-        accel_factor = 0.0
-        # Gyroscope data
-        if t_address < t < t_backswing_end:
-            gyro_x = (-15 * gyro_scale) * math.sin((t - t_address) * math.pi / (t_backswing_end - t_address)) + drift_x + noise_gyro
-            gyro_y = (10 * gyro_scale) * math.sin((t - t_address) * math.pi / (t_backswing_end - t_address)) + drift_y + noise_gyro
-            gyro_z = (20 * gyro_scale) * math.sin((t - t_address) * math.pi / (t_backswing_end - t_address)) + drift_z + noise_gyro
-        elif t_backswing_end <= t < t_impact:
-            gyro_x = (30 * gyro_scale) * math.sin((t - t_backswing_end) * math.pi / (t_downswing_end - t_backswing_end)) + drift_x + noise_gyro
-            gyro_y = (-40 * gyro_scale) * math.sin((t - t_backswing_end) * math.pi / (t_downswing_end - t_backswing_end)) + drift_y + noise_gyro
-            gyro_z = (-50 * gyro_scale) * math.sin((t - t_backswing_end) * math.pi / (t_downswing_end - t_backswing_end)) + drift_z + noise_gyro
-        elif t_impact <= t < t_finish:
-            gyro_x = (10 * gyro_scale) * math.sin((t - t_impact) * math.pi / (t_finish - t_impact)) + drift_x + noise_gyro
-            gyro_y = (15 * gyro_scale) * math.sin((t - t_impact) * math.pi / (t_finish - t_impact)) + drift_y + noise_gyro
-            gyro_z = (-10 * gyro_scale) * math.sin((t - t_impact) * math.pi / (t_finish - t_impact)) + drift_z + noise_gyro
-        else:
-            gyro_x, gyro_y, gyro_z = drift_x + noise_gyro, drift_y + noise_gyro, drift_z + noise_gyro
-
-        gyro_x += 0.3 * gyro_spike_amp * impact_factor + 0.05 * path_bias * impact_factor
-        gyro_y += -0.2 * gyro_spike_amp * impact_factor
-        gyro_z += 0.5 * gyro_spike_amp * impact_factor
-
-        # Accelerometer data
-        if t_address < t < t_backswing_end:
-            accel_x = 5 * math.sin((t - t_address) * math.pi / (t_backswing_end - t_address)) + noise_accel
-            accel_y = -9.8 + 2 * math.sin((t - t_address) * math.pi / (t_backswing_end - t_address)) + noise_accel
-            accel_z = 3 * math.sin((t - t_address) * math.pi / (t_backswing_end - t_address)) + noise_accel
-        elif t_backswing_end <= t < t_impact:
-            # Downswing: build a vector whose mean dynamic Y component aligns with y_attack_bias.
-            progress = (t - t_backswing_end) / (t_downswing_end - t_backswing_end)
-            accel_factor = math.sin(progress * math.pi / 2)
-
-            # Forward acceleration dominates the horizontal magnitude; lateral component follows path bias.
-            forward_peak = 14.0
-            lateral_peak = 0.25 * path_bias
-            base_forward = -forward_peak * accel_factor
-            base_lateral = lateral_peak * accel_factor
-
-            horizontal_mag = math.sqrt(base_forward * base_forward + base_lateral * base_lateral)
-            attack_slope = math.tan(math.radians(y_attack_bias))
-            vertical_dynamic = horizontal_mag * attack_slope
-
-            accel_x = base_lateral + noise_accel
-            accel_y = -9.8 + vertical_dynamic + noise_accel
-            accel_z = base_forward + noise_accel
-        elif t_impact <= t < t_finish:
-            accel_x = -5 * math.sin((t - t_impact) * math.pi / (t_finish - t_impact)) + noise_accel
-            accel_y = -9.8 + 3 * math.sin((t - t_impact) * math.pi / (t_finish - t_impact)) + noise_accel
-            accel_z = 5 * math.sin((t - t_impact) * math.pi / (t_finish - t_impact)) + noise_accel
-        else:
-            accel_x, accel_y, accel_z = noise_accel, -9.8 + noise_accel, noise_accel
-
-        accel_x *= accel_scale
-        accel_y *= accel_scale
-        accel_z *= accel_scale
+    # Column-wise generation: draw every per-sample random stream up front, then let
+    # _fill_swing fill the preallocated columns (structure of arrays, contiguous float32).
+    n = len(grid_t)
+    noise_accel = _uniform_buffer(rng, -noise_accel_range, noise_accel_range, n)
+    noise_gyro = _uniform_buffer(rng, -noise_gyro_range, noise_gyro_range, n)
+    n_spike = spike_idx[1] - spike_idx[0]
+    accel_spike_amp = _uniform_buffer(rng, 0.9 * accel_spike_base, 1.1 * accel_spike_base, n_spike)
+    gyro_spike_amp = _uniform_buffer(rng, 0.9 * gyro_spike_base, 1.1 * gyro_spike_base, n_spike)
 
-        if t_backswing_end <= t < t_finish:
-            if t < t_impact:
-                phase_scale = 0.18 + 0.22 * accel_factor
-            else:
-                phase_scale = 0.12
-            accel_x += path_bias * phase_scale
-
-        accel_x += 0.4 * accel_spike_amp * impact_factor
-        accel_y += 1.0 * accel_spike_amp * impact_factor * launch_multiplier
-        accel_z += 0.3 * accel_spike_amp * impact_factor
-
-        data.append({
-            'timestamp': t,
-            'accel_x': accel_x, 'accel_y': accel_y, 'accel_z': accel_z,
-            'gyro_x': gyro_x, 'gyro_y': gyro_y, 'gyro_z': gyro_z
-        })
+    accel_x, accel_y, accel_z = (array(SENSOR_TYPECODE, bytes(4 * n)) for _ in range(3))
+    gyro_x, gyro_y, gyro_z = (array(SENSOR_TYPECODE, bytes(4 * n)) for _ in range(3))
+    _fill_swing(
+        grid_t, PHASE_TIMES, phase_idx,
+        gyro_scale, accel_scale, y_attack_bias, path_bias, launch_multiplier,
+        SPIKE_SIGMA, spike_idx,
+        noise_accel, noise_gyro, accel_spike_amp, gyro_spike_amp,
+        (accel_x, accel_y, accel_z), (gyro_x, gyro_y, gyro_z),
+    )
 
     GYRO_TO_KPH = 1.5
 
-    def est_kph(samples):
-        peak = 0.0
-        for s in samples:
-            gmag = math.sqrt(s['gyro_x']**2 + s['gyro_y']**2 + s['gyro_z']**2)
-            if gmag > peak:
-                peak = gmag
-        return peak * GYRO_TO_KPH
-
-    before_kph = est_kph(data)
+    # Exact peak gyro magnitude, reduced only over the range where it can occur
+    # (the speed calibration needs the true peak, so no analytic shortcut). The
+    # post-scale speed follows from linearity, so no second pass is needed.
+    p0, p1 = peak_idx
+    peak_gyro = math.sqrt(max((gx * gx + gy * gy + gz * gz
+                               for gx, gy, gz in zip(gyro_x[p0:p1], gyro_y[p0:p1], gyro_z[p0:p1])), default=0.0))
+    before_kph = peak_gyro * GYRO_TO_KPH
     if profile == 'good':
-        target_kph = random.uniform(121.0, 137.0)
+        target_kph = rng.uniform(121.0, 137.0)
     elif profile == 'okay':
-        target_kph = random.uniform(116.0, 132.0)
+        target_kph = rng.uniform(116.0, 132.0)
     else:
-        target_kph = random.uniform(100.0, 128.0)
+        target_kph = rng.uniform(100.0, 128.0)
     scale = (target_kph / before_kph) if before_kph > 1e-6 else 1.0
 
-    for s in data:
-        s['gyro_x'] *= scale
-        s['gyro_y'] *= scale
-        s['gyro_z'] *= scale
-        ax_dyn = s['accel_x']
-        ay_dyn = s['accel_y'] + 9.8
-        az_dyn = s['accel_z']
-        ax_dyn *= scale
-        ay_dyn *= scale
-        az_dyn *= scale
-        s['accel_x'] = ax_dyn
-        s['accel_y'] = -9.8 + ay_dyn
-        s['accel_z'] = az_dyn
-
-    after_kph = est_kph(data)
+    # Rescale columns in place; accel is scaled on its dynamic part (gravity removed from Y)
+    for col in (gyro_x, gyro_y, gyro_z, accel_x, accel_z):
+        col[:] = array(SENSOR_TYPECODE, (v * scale for v in col))
+    accel_y[:] = array(SENSOR_TYPECODE, (-9.8 + (a + 9.8) * scale for a in accel_y))
+    accel = (accel_x, accel_y, accel_z)
+    gyro = (gyro_x, gyro_y, gyro_z)
+
+    after_kph = before_kph * scale
 
     sim_meta.update({
         'speed_target_kph': round(target_kph, 1),
@@ -218,39 +335,117 @@ def create_simulated_swing_data(num_samples, total_duration_s):
         'scale_applied': round(scale, 3),
     })
 
-    return data, sim_meta
+    return (array('d', grid_t), accel, gyro), sim_meta
+
+def generate_many(n_swings, num_samples, total_duration_s, seed=None, max_workers=None):
+    """
+    Generate n_swings independent swings, in parallel across processes.
+
+    Each swing gets its own seed drawn from `seed`, so a batch is reproducible
+    regardless of how the work is split. Returns a list of (data, sim_meta)
+    tuples as produced by create_simulated_swing_data.
+    """
+    master = random.Random(seed)
+    seeds = [master.getrandbits(64) for _ in range(n_swings)]
+    if n_swings <= 1 or max_workers == 1:
+        return [create_simulated_swing_data(num_samples, total_duration_s, s) for s in seeds]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(create_simulated_swing_data,
+                             [num_samples] * n_swings, [total_duration_s] * n_swings, seeds))
+
+def _to_columns(timestamp, accel, gyro):
+    """Column-oriented samples as stored in the JSON file: one list of values per key."""
+    columns = {'timestamp': timestamp.tolist()}
+    for prefix, axes in (('accel', accel), ('gyro', gyro)):
+        for suffix, col in zip('xyz', axes):
+            columns[f'{prefix}_{suffix}'] = col.tolist()
+    return columns
+
+def _to_records(timestamp, accel, gyro):
+    """Materialize the column arrays as per-sample dicts."""
+    return [
+        {
+            'timestamp': t,
+            'accel_x': a_x, 'accel_y': a_y, 'accel_z': a_z,
+            'gyro_x': g_x, 'gyro_y': g_y, 'gyro_z': g_z
+        }
+        for t, a_x, a_y, a_z, g_x, g_y, g_z in zip(timestamp, *accel, *gyro)
+    ]
+
+def _dumps(obj, indent=False):
+    """Serialize obj to UTF-8 JSON bytes, with orjson's C encoder when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _is_json_array(filename):
+    """True if filename exists and holds the legacy format: one JSON array of swings."""
+    if not os.path.exists(filename):
+        return False
+    with open(filename, 'r') as f:
+        while True:
+            ch = f.read(1)
+            if not ch:
+                return False
+            if not ch.isspace():
+                return ch == '['
 
 def save_swing_to_json(filename, samples, metadata=None):
+    """
+    Append one swing to filename. samples is usually the column dict from
+    _to_columns(); a list of per-sample dicts is stored as-is.
+
+    The file is JSON Lines (one swing object per line), so appending costs the
+    same no matter how many swings are already stored. A file in the legacy
+    format (a single JSON array) is still read, extended and rewritten.
+    """
     swing_entry = {
         "metadata": metadata or {},
         "samples": samples,
     }
-    existing = []
-    if os.path.exists(filename):
+    if _is_json_array(filename):
+        existing = []
         try:
-            with open(filename, 'r') as f:
-                content = f.read().strip()
-                if content:
-                    loaded = json.loads(content)
-                    if isinstance(loaded, list):
-                        existing = loaded
+            with open(filename, 'rb') as f:
+                loaded = _loads(f.read())
+                if isinstance(loaded, list):
+                    existing = loaded
         except Exception:
             existing = []
-    existing.append(swing_entry)
-    with open(filename, 'w') as f:
-        json.dump(existing, f, indent=2)
+        existing.append(swing_entry)
+        with open(filename, 'wb') as f:
+            f.write(_dumps(existing, indent=True))
+        return
+    with open(filename, 'ab') as f:
+        f.write(_dumps(swing_entry) + b'\n')
+
+def load_swings(filename):
+    """Yield swings one at a time from a JSON Lines file (or a legacy JSON array file)."""
+    if _is_json_array(filename):
+        with open(filename, 'rb') as f:
+            yield from _loads(f.read())
+        return
+    with open(filename, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield _loads(line)
 
 if __name__ == '__main__':
+    # Usage: golf_swing_simulator.py [num_swings]
+    num_swings = int(sys.argv[1]) if len(sys.argv) > 1 else 1
     print("Generating simulated golf swing data...")
     num_samples = 500
     total_duration_s = 5.0
-    simulated_data, sim_meta = create_simulated_swing_data(num_samples=num_samples, total_duration_s=total_duration_s)
-    output_file = 'simulated_sensor_data.json'
-    metadata = {
-        "generated_at": time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime()),
-        "num_samples": num_samples,
-        "total_duration_s": total_duration_s,
-        "sim_profile": sim_meta,
-    }
-    save_swing_to_json(output_file, simulated_data, metadata)
-    print(f"Simulation complete. Swing appended to {output_file}")
\ No newline at end of file
+    output_file = 'simulated_sensor_data.jsonl'
+    for simulated_data, sim_meta in generate_many(num_swings, num_samples, total_duration_s):
+        metadata = {
+            "generated_at": time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime()),
+            "num_samples": num_samples,
+            "total_duration_s": total_duration_s,
+            "sim_profile": sim_meta,
+        }
+        save_swing_to_json(output_file, _to_columns(*simulated_data), metadata)
+    print(f"Simulation complete. {num_swings} swing(s) appended to {output_file}")
@@ -1,10 +1,42 @@
+import atexit
+import gzip
 import json
+import logging
 import math
 import os
+import socket
+import struct
 import sys
-from typing import List, Dict, Tuple
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from functools import partial
+from itertools import accumulate, chain, islice
+from multiprocessing import get_all_start_methods, get_context
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
 from urllib.parse import urlparse, parse_qs
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library json module
+    orjson = None
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; the kernels then run as plain Python
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
 """
 Pure-Python swing analyzer that reads the latest swing from simulated_sensor_data.json
 and computes approximate metrics: Club Speed, Launch Angle, Attack Angle, Club Path, Spin Rate (approx.).
@@ -13,20 +45,227 @@ Assumptions/Notes:
 - Gravity is assumed along negative Y (-9.8 m/s^2) in the global frame.
 - Orientation/sensor fusion is NOT implemented; accelerations are treated in a simplified manner.
 - Integration is naive (no drift correction), suitable only for demonstration with synthetic data.
-- Input file format (created by golf_swing_simulator.py):
-  [ { "metadata": {...}, "samples": [ {timestamp, accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z}, ... ] }, ...]
+- Input file format (created by golf_swing_simulator.py), JSON Lines with one swing per line:
+  { "metadata": {...}, "samples": {"timestamp": [...], "accel_x": [...], ..., "gyro_z": [...]} }
+  Per-sample lists ("samples": [ {timestamp, accel_x, ..., gyro_z}, ... ]) and the legacy
+  single JSON array of swings are still accepted.
 - Output: prints metrics and writes latest_swing_stats.json for app consumption.
 """
 
 
-def load_latest_swing(path: str) -> List[Dict]:
+_log = logging.getLogger(__name__)
+
+# Club length for served metrics: a 5-iron, ~38 inches
+DEFAULT_CLUB_LENGTH_M = 0.9652
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, with orjson's C encoder when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+_MODULE_DIR = os.path.dirname(__file__)
+_SRC_PATH = os.path.join(_MODULE_DIR, 'simulated_sensor_data.jsonl')
+_LEGACY_SRC_PATH = os.path.join(_MODULE_DIR, 'simulated_sensor_data.json')
+_OUT_PATH = os.path.join(_MODULE_DIR, 'latest_swing_stats.json')
+
+
+def default_data_path() -> str:
+    """Simulator output next to this module: the JSON Lines file if present, else the legacy JSON array."""
+    return _SRC_PATH if os.path.exists(_SRC_PATH) else _LEGACY_SRC_PATH
+
+
+SAMPLE_KEYS = ('timestamp', 'accel_x', 'accel_y', 'accel_z', 'gyro_x', 'gyro_y', 'gyro_z')
+
+# Sensor columns are held as float32, like the simulator writes them: IMU noise is
+# far above float32 resolution. Timestamps and everything derived (sums, dt,
+# magnitudes) stay float64.
+SENSOR_TYPECODE = 'f'
+
+
+@dataclass
+class SampleArrays:
+    """
+    One swing (or flat recording) as parallel columns instead of a list of
+    per-sample dicts: float32 sensor columns and float64 timestamps.
+    Missing sensor values read as 0.0, missing timestamps as NaN, and any
+    non-numeric value as NaN. Slicing (arr[a:b]) returns a SampleArrays
+    over that range. The conversion is lossy, so these are for analysis
+    only: anything written back to a file uses the original records.
+    """
+    ax: array
+    ay: array
+    az: array
+    gx: array
+    gy: array
+    gz: array
+    t: array
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            raise TypeError('SampleArrays only supports slicing')
+        return SampleArrays(*(getattr(self, f.name)[key] for f in fields(self)))
+
+    @classmethod
+    def from_samples(cls, samples: List[Dict]) -> 'SampleArrays':
+        def col(key):
+            return array(SENSOR_TYPECODE, [v if isinstance(v, (int, float)) else math.nan
+                                           for v in (s.get(key, 0.0) for s in samples)])
+
+        return cls(col('accel_x'), col('accel_y'), col('accel_z'),
+                   col('gyro_x'), col('gyro_y'), col('gyro_z'), _timestamp_column(samples))
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List[float]]) -> 'SampleArrays':
+        n = max((len(columns[k]) for k in SAMPLE_KEYS if k in columns), default=0)
+
+        def col(key, typecode=SENSOR_TYPECODE, missing=0.0):
+            if key not in columns:
+                return array(typecode, [missing]) * n
+            return array(typecode, [v if isinstance(v, (int, float)) else math.nan for v in columns[key]])
+
+        return cls(col('accel_x'), col('accel_y'), col('accel_z'),
+                   col('gyro_x'), col('gyro_y'), col('gyro_z'), col('timestamp', 'd', math.nan))
+
+
+Samples = Union[List[Dict], SampleArrays]
+
+
+def samples_to_arrays(samples) -> SampleArrays:
+    """Return samples as SampleArrays: per-sample dicts, column dicts and SampleArrays are all accepted."""
+    if isinstance(samples, SampleArrays):
+        return samples
+    if isinstance(samples, dict):
+        return SampleArrays.from_columns(samples)
+    return SampleArrays.from_samples(samples)
+
+
+def _timestamp_column(samples) -> array:
+    """Float64 timestamps (non-numeric as NaN) without converting the sensor columns."""
+    if isinstance(samples, SampleArrays):
+        return samples.t
+    if isinstance(samples, dict):
+        values = samples.get('timestamp', ())
+    else:
+        values = (s.get('timestamp') for s in samples)
+    return array('d', [v if isinstance(v, (int, float)) else math.nan for v in values])
+
+
+def _read_swings(path: str) -> List[Dict]:
+    """Parse a swings file: JSON Lines (one swing per line) or a legacy JSON array.
+    Each swing's samples are converted to SampleArrays."""
     if not os.path.exists(path):
         raise FileNotFoundError(f"File not found: {path}")
-    with open(path, 'r') as f:
-        data = json.load(f)
-    if not isinstance(data, list) or len(data) == 0:
-        raise ValueError("Expected a non-empty JSON array of swings")
-    swing = data[-1]
+    with open(path, 'rb') as f:
+        content = f.read()
+    if content.lstrip().startswith(b'['):
+        swings = _loads(content)
+    else:
+        swings = [_loads(line) for line in content.splitlines() if line.strip()]
+    if isinstance(swings, list):
+        for swing in swings:
+            if isinstance(swing, dict) and isinstance(swing.get('samples'), (dict, list)):
+                swing['samples'] = samples_to_arrays(swing['samples'])
+    return swings
+
+
+# path -> (st_mtime_ns, st_size, parsed swings)
+_CACHE: Dict[str, Tuple[int, int, object]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+# path -> ((st_mtime_ns, st_size), {result key: computed result})
+_RESULTS: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+_RESULTS_MAX = 4096  # room for every swing x the _TEMPO_RECENT sets on a long session file
+
+
+def _file_version(path: str) -> Tuple[int, int]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {path}")
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _load_parsed(path: str) -> List[Dict]:
+    """
+    _read_swings(path), memoized on the file's mtime and size so repeated
+    requests against an unchanged file cost a single os.stat.
+    The returned swings are shared between callers and must not be mutated.
+    """
+    key = _file_version(path)
+    with _CACHE_LOCK:
+        hit = _CACHE.get(path)
+        if hit is not None and hit[:2] == key:
+            return hit[2]
+    swings = _read_swings(path)
+    with _CACHE_LOCK:
+        _CACHE[path] = key + (swings,)
+    return swings
+
+
+def _results_for(path: str) -> Dict:
+    """
+    Memo of computed results (metrics, tempo) for the current version of path.
+    A new, empty dict is started whenever the file's mtime or size changes;
+    results stored in it are shared and must not be mutated.
+    """
+    version = _file_version(path)
+    with _CACHE_LOCK:
+        entry = _RESULTS.get(path)
+        if entry is None or entry[0] != version or len(entry[1]) >= _RESULTS_MAX:
+            entry = (version, {})
+            _RESULTS[path] = entry
+        return entry[1]
+
+
+def load_last_swing(path: str) -> Dict:
+    """
+    The last swing in path, samples as SampleArrays. A JSON Lines file is read
+    backwards from its end until the final line is complete, so only that swing
+    is parsed; a legacy JSON array (or a file already in the parse cache) goes
+    through _load_parsed.
+    """
+    key = _file_version(path)
+    with _CACHE_LOCK:
+        hit = _CACHE.get(path)
+    with open(path, 'rb') as f:
+        if (hit is not None and hit[:2] == key) or f.read(64).lstrip().startswith(b'['):
+            return load_all_swings(path)[-1]
+        pos = f.seek(0, os.SEEK_END)
+        buf = b''
+        line = b''
+        while pos > 0:
+            step = min(1 << 16, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            tail = buf.rstrip()
+            nl = tail.rfind(b'\n')
+            if nl >= 0:
+                line = tail[nl + 1:]
+                break
+        else:
+            line = buf.strip()
+    if not line:
+        raise ValueError(f"Expected at least one swing (one JSON object per line) in {path}")
+    swing = _loads(line)
+    if isinstance(swing, dict) and isinstance(swing.get('samples'), (dict, list)):
+        swing['samples'] = samples_to_arrays(swing['samples'])
+    return swing
+
+
+def load_latest_swing(path: str) -> SampleArrays:
+    swing = load_last_swing(path)
     samples = swing.get('samples', [])
     if not samples:
         raise ValueError("Latest swing contains no samples")
@@ -34,74 +273,216 @@ def load_latest_swing(path: str) -> List[Dict]:
 
 
 def load_all_swings(path: str) -> List[Dict]:
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"File not found: {path}")
-    with open(path, 'r') as f:
-        data = json.load(f)
+    data = _load_parsed(path)
     if not isinstance(data, list) or len(data) == 0:
         raise ValueError("Expected a non-empty JSON array of swings")
     return data
 
 
-def estimate_dt(samples: List[Dict]) -> float:
+def iter_swings(path: str) -> Iterator[Dict]:
+    """
+    Yield swings one at a time, samples as SampleArrays. JSON Lines files are
+    streamed line by line so only one swing is held at once; a legacy JSON array
+    has to be parsed in full.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if line.lstrip().startswith(b'['):
+                break
+            swing = _loads(line)
+            if isinstance(swing, dict) and isinstance(swing.get('samples'), (dict, list)):
+                swing['samples'] = samples_to_arrays(swing['samples'])
+            yield swing
+        else:
+            return
+    yield from _load_parsed(path)
+
+
+def estimate_dt(samples: Samples) -> float:
     # Use timestamps if available; fall back to average spacing
-    times = [s.get('timestamp', None) for s in samples]
-    times = [t for t in times if isinstance(t, (int, float))]
+    times = _timestamp_column(samples)
+    if math.isnan(sum(times)):  # a NaN anywhere poisons the sum; drop them only then
+        times = [t for t in times if t == t]
     if len(times) >= 2:
-        # average delta
-        diffs = [t2 - t1 for t1, t2 in zip(times[:-1], times[1:])]
-        # guard against zeros
-        diffs = [d for d in diffs if d > 0]
+        # average delta in one pass over the column (islice avoids two slice copies)
+        diffs = [t2 - t1 for t1, t2 in zip(times, islice(times, 1, None))]
+        total = sum(diffs)
+        # guard against zeros (only filter when there may be something to drop;
+        # a NaN diff, e.g. inf - inf, slips past min() but not the finite sum check)
+        if not (min(diffs) > 0 and math.isfinite(total)):
+            diffs = [d for d in diffs if d > 0]
+            total = sum(diffs)
         if diffs:
-            return sum(diffs) / len(diffs)
+            return total / len(diffs)
     # default to 1/100 s if unknown
     return 0.01
 
 
-def find_impact_index(samples: List[Dict]) -> int:
-    # Peak gyroscope magnitude heuristic
-    max_mag = -1.0
-    idx = 0
-    for i, s in enumerate(samples):
-        gx, gy, gz = s['gyro_x'], s['gyro_y'], s['gyro_z']
-        mag = math.sqrt(gx*gx + gy*gy + gz*gz)
-        if mag > max_mag:
-            max_mag = mag
-            idx = i
-    return idx
+def _argmax(values, start: int = 0, stop: int = None) -> int:
+    """
+    Index of the first maximum of values[start:stop], i.e.
+    max(range(start, stop), key=values.__getitem__) with a C-level max() and index().
+    """
+    stop = len(values) if stop is None else stop
+    best = max(islice(values, start, stop))
+    try:
+        return values.index(best, start, stop)
+    except ValueError:  # a leading NaN stays the max() but never compares equal in an array
+        return start
+
+
+def _argmin(values, start: int = 0, stop: int = None) -> int:
+    """Index of the first minimum of values[start:stop]; see _argmax."""
+    stop = len(values) if stop is None else stop
+    best = min(islice(values, start, stop))
+    try:
+        return values.index(best, start, stop)
+    except ValueError:
+        return start
+
+
+def find_impact_index(samples: Samples, gyro_mag: List[float] = None) -> int:
+    # Peak gyroscope magnitude heuristic (first occurrence of the maximum);
+    # pass gyro_mag from compute_gyro_mag to reuse an existing magnitude pass
+    mags = compute_gyro_mag(samples) if gyro_mag is None else gyro_mag
+    return _argmax(mags) if len(mags) else 0
 
 
 # -----------------------------
 # Tempo-first utilities
 # -----------------------------
 
-def _magnitude3(x: float, y: float, z: float) -> float:
-    return math.sqrt(x * x + y * y + z * z)
+def _kernel_input(values):
+    """Input for the EMA and scan kernels: numba wants a typed buffer, not a list."""
+    if HAVE_NUMBA and not isinstance(values, array):
+        return array('d', values)
+    return values
+
+
+@njit(cache=True, nogil=True)
+def _ema(values, alpha, out):
+    """EMA recurrence of smooth_ema written into out (same length as values)."""
+    beta = 1 - alpha
+    y = values[0]
+    out[0] = y
+    for i in range(1, len(values)):
+        y = alpha * values[i] + beta * y
+        out[i] = y
+
+
+def _smooth_ema_buffer(values, alpha: float = 0.2):
+    """
+    smooth_ema for the detector kernels: with numba, the kernel's array('d')
+    is returned as is rather than round-tripping through a list.
+    """
+    if HAVE_NUMBA and len(values):
+        out = array('d', [0.0]) * len(values)
+        _ema(_kernel_input(values), float(alpha), out)
+        return out
+    return smooth_ema(values, alpha)
 
 
 def smooth_ema(values: List[float], alpha: float = 0.2) -> List[float]:
-    """Simple exponential moving average (no external deps)."""
+    """
+    Simple exponential moving average (no external deps):
+    y[0] = x[0], y[t] = alpha * x[t] + (1 - alpha) * y[t-1].
+    """
     if not values:
         return []
-    out = [values[0]]
-    for v in values[1:]:
-        out.append(alpha * v + (1 - alpha) * out[-1])
+    if HAVE_NUMBA:
+        return _smooth_ema_buffer(values, alpha).tolist()
+    beta = 1 - alpha
+    it = iter(values)
+    y = next(it)
+    out = [y]
+    append = out.append
+    # Carry y in a local rather than re-reading out[-1]; no slice copy of values
+    for v in it:
+        y = alpha * v + beta * y
+        append(y)
     return out
 
 
+def smooth_box(values: List[float], window: int) -> List[float]:
+    """
+    Centered moving average over `window` samples (truncated at the edges).
+    Built from one prefix-sum pass, so every output is an independent
+    difference rather than a step of a serial recurrence like smooth_ema.
+    """
+    n = len(values)
+    if not n:
+        return []
+    w = max(1, min(int(window), n))
+    half = w // 2
+    p = list(accumulate(values, initial=0.0))
+    head = [p[i + w - half] / (i + w - half) for i in range(half)]
+    inv = 1.0 / w
+    full = [(b - a) * inv for a, b in zip(p, islice(p, w, None))]
+    tail = [(p[n] - p[i - half]) / (n - i + half) for i in range(n - w + half + 1, n)]
+    return head + full + tail
+
+
+@njit(cache=True, nogil=True)
+def _first_run_above(values, threshold, min_len):
+    """Start of the first run of min_len consecutive values > threshold, or -1."""
+    run = 0
+    for i in range(len(values)):
+        if values[i] > threshold:
+            run += 1
+            if run >= min_len:
+                return i - min_len + 1
+        else:
+            run = 0
+    return -1
+
+
+@njit(cache=True, nogil=True)
+def _first_sign_change(values, s):
+    """First index after s where values changes sign (zeros carry no sign), or -1."""
+    n = len(values)
+    prev = values[s] if s < n else 0.0
+    for i in range(s + 1, n):
+        cur = values[i]
+        if prev == 0:
+            prev = cur
+            continue
+        if (prev > 0 and cur <= 0) or (prev < 0 and cur >= 0):
+            return i
+        prev = cur
+    return -1
+
+
+@njit(cache=True, nogil=True)
+def _first_peak_above(values, threshold, i0, refractory):
+    """Local peak within refractory samples of the first value >= threshold from i0, or -1."""
+    n = len(values)
+    for i in range(i0, n):
+        if values[i] >= threshold:
+            j_end = min(n, i + refractory)
+            peak_idx = i
+            peak_val = values[i]
+            for j in range(i + 1, j_end):
+                if values[j] > peak_val:
+                    peak_val = values[j]
+                    peak_idx = j
+            return peak_idx
+    return -1
+
+
 def detect_start(gyro_mag: List[float], hz: float, threshold_deg_s: float = 45.0, min_ms: int = 100) -> int:
     """First index where gyro magnitude stays above threshold for min_ms."""
     if not gyro_mag:
         return 0
     min_len = max(1, int((min_ms / 1000.0) * hz))
-    above = [g > threshold_deg_s for g in gyro_mag]
-    run = 0
-    for i, ok in enumerate(above):
-        run = run + 1 if ok else 0
-        if run >= min_len:
-            return i - min_len + 1
+    idx = _first_run_above(_kernel_input(gyro_mag), float(threshold_deg_s), min_len)
+    if idx >= 0:
+        return idx
     # fallback: peak location
-    return max(range(len(gyro_mag)), key=lambda i: gyro_mag[i])
+    return _argmax(gyro_mag)
 
 
 def detect_top(gyro_axis: List[float], start_idx: int) -> int:
@@ -109,18 +490,11 @@ def detect_top(gyro_axis: List[float], start_idx: int) -> int:
     if not gyro_axis:
         return 0
     s = max(0, start_idx)
-    prev = gyro_axis[s] if s < len(gyro_axis) else 0.0
-    for i in range(s + 1, len(gyro_axis)):
-        cur = gyro_axis[i]
-        if prev == 0:
-            prev = cur
-            continue
-        if (prev > 0 and cur <= 0) or (prev < 0 and cur >= 0):
-            return i
-        prev = cur
+    idx = _first_sign_change(_kernel_input(gyro_axis), s)
+    if idx >= 0:
+        return idx
     # fallback: global min after start (change of direction likely)
-    tail = gyro_axis[s:]
-    return s + (min(range(len(tail)), key=lambda i: tail[i]))
+    return _argmin(gyro_axis, s)
 
 
 def detect_impact(accel_mag: List[float], hz: float, threshold_g: float = 10.0, refractory_ms: int = 25, start_from: int = 0) -> int:
@@ -131,85 +505,101 @@ def detect_impact(accel_mag: List[float], hz: float, threshold_g: float = 10.0,
     thr = threshold_g * 9.81
     i0 = min(max(0, start_from), n - 1)
     refractory = max(1, int((refractory_ms / 1000.0) * hz))
-    i = i0
-    while i < n:
-        if accel_mag[i] >= thr:
-            # find local peak within refractory window
-            j_end = min(n, i + refractory)
-            peak_idx = i
-            peak_val = accel_mag[i]
-            for j in range(i + 1, j_end):
-                if accel_mag[j] > peak_val:
-                    peak_val = accel_mag[j]
-                    peak_idx = j
-            return peak_idx
-        i += 1
+    idx = _first_peak_above(_kernel_input(accel_mag), float(thr), i0, refractory)
+    if idx >= 0:
+        return idx
     # fallback: choose the strongest sample AFTER the requested start index.
-    tail = accel_mag[i0:]
-    if tail:
-        rel_idx = max(range(len(tail)), key=lambda k: tail[k])
-        return i0 + rel_idx
-    # If start_from was past the end, just return the global max.
-    return max(range(n), key=lambda k: accel_mag[k])
+    return _argmax(accel_mag, i0)
+
+
+@dataclass
+class TempoSignals:
+    """
+    Sampling rate and smoothed signals scanned by compute_tempo's detectors.
+    They depend only on the swing and the smoothing mode, so one instance can
+    be reused for every threshold/axis combination asked of the same swing.
+    """
+    cols: SampleArrays
+    dt: float
+    hz: float
+    gyro_mag_s: List[float]
+    accel_mag_s: List[float]
+    # smoothed primary-axis signals, keyed by column name and filled on demand
+    axes: Dict[str, List[float]]
+
+    @classmethod
+    def build(cls, samples: Samples, smoothing: str = 'ema') -> 'TempoSignals':
+        cols = samples_to_arrays(samples)
+
+        # derive sampling rate
+        dt = estimate_dt(cols)
+        hz = 1.0 / max(dt, 1e-6)
+
+        # build signals: magnitudes in one C-level pass per sensor
+        gyro_mag = compute_gyro_mag(cols)
+        accel_mag = list(map(math.hypot, cols.ax, cols.ay, cols.az))
+
+        # smooth
+        if smoothing == 'box':
+            w = max(3, int(0.03 * hz))
+            gyro_mag_s = smooth_box(gyro_mag, w)
+            accel_mag_s = smooth_box(accel_mag, w)
+        else:
+            gyro_mag_s = _smooth_ema_buffer(gyro_mag, alpha=0.2)
+            accel_mag_s = _smooth_ema_buffer(accel_mag, alpha=0.2)
+        return cls(cols, dt, hz, _kernel_input(gyro_mag_s), _kernel_input(accel_mag_s), {})
 
+    def axis(self, primary_axis: str) -> List[float]:
+        """EMA-smoothed gyro column for primary_axis (gyro_y when unknown)."""
+        name = {'gyro_x': 'gx', 'gyro_z': 'gz'}.get(primary_axis, 'gy')
+        axis_s = self.axes.get(name)
+        if axis_s is None:
+            axis_s = self.axes[name] = _kernel_input(_smooth_ema_buffer(getattr(self.cols, name), alpha=0.2))
+        return axis_s
 
-def compute_tempo(samples: List[Dict], primary_axis: str = 'gyro_y',
+
+def compute_tempo(samples: Samples, primary_axis: str = 'gyro_y',
                   start_threshold_deg_s: float = 5.0, start_min_ms: int = 100,
                   impact_threshold_g: float = 1.5, refractory_ms: int = 25,
-                  allow_fallback: bool = True) -> Dict:
-    """Compute start/top/impact indices and tempo metrics for one swing's samples."""
+                  allow_fallback: bool = True, smoothing: str = 'ema',
+                  signals: TempoSignals = None) -> Dict:
+    """
+    Compute start/top/impact indices and tempo metrics for one swing's samples.
+    smoothing='box' smooths the two magnitude signals with smooth_box (~30 ms
+    window) instead of smooth_ema; the primary axis always uses the EMA, which
+    keeps its zero-crossing phase. signals (TempoSignals.build of the same
+    samples and smoothing) skips rebuilding them.
+    """
     if not samples:
         raise ValueError('No samples provided')
 
-    # derive sampling rate
-    dt = estimate_dt(samples)
-    hz = 1.0 / max(dt, 1e-6)
-
-    # build signals
-    gx = [s.get('gyro_x', 0.0) for s in samples]
-    gy = [s.get('gyro_y', 0.0) for s in samples]
-    gz = [s.get('gyro_z', 0.0) for s in samples]
-    ax = [s.get('accel_x', 0.0) for s in samples]
-    ay = [s.get('accel_y', 0.0) for s in samples]
-    az = [s.get('accel_z', 0.0) for s in samples]
-
-    gyro_mag = [_magnitude3(gx[i], gy[i], gz[i]) for i in range(len(samples))]
-    accel_mag = [_magnitude3(ax[i], ay[i], az[i]) for i in range(len(samples))]
-
-    # smooth
-    gyro_mag_s = smooth_ema(gyro_mag, alpha=0.2)
-    accel_mag_s = smooth_ema(accel_mag, alpha=0.2)
-
-    axis_map = {
-        'gyro_x': gx,
-        'gyro_y': gy,
-        'gyro_z': gz,
-    }
-    axis = axis_map.get(primary_axis, gy)
-    axis_s = smooth_ema(axis, alpha=0.2)
+    if signals is None:
+        signals = TempoSignals.build(samples, smoothing)
+    dt, hz = signals.dt, signals.hz
+    gyro_mag_s, accel_mag_s = signals.gyro_mag_s, signals.accel_mag_s
+    axis_s = signals.axis(primary_axis)
 
     start_idx = detect_start(gyro_mag_s, hz, start_threshold_deg_s, start_min_ms)
     # Provisional top from smoothed axis zero-cross
     top_idx = detect_top(axis_s, start_idx)
-    print(f"DEBUG: Axis {primary_axis}, Start: {start_idx}, Provisional Top: {top_idx}")
+    _log.debug("Axis %s, Start: %d, Provisional Top: %d", primary_axis, start_idx, top_idx)
 
     # Provisional impact using accel magnitude after provisional top; if that is pathological, we will recompute
     impact_idx = detect_impact(accel_mag_s, hz, impact_threshold_g, refractory_ms, start_from=top_idx + 1)
 
     # Sanity check: ensure downswing duration is plausible; otherwise choose top as argmin of gyro magnitude between start and impact
-    dt = estimate_dt(samples)
     if impact_idx <= start_idx:
         impact_idx = detect_impact(accel_mag_s, hz, impact_threshold_g, refractory_ms, start_from=start_idx)
     downswing_dt = max(0.0, (impact_idx - max(start_idx, top_idx)) * dt)
-    print(f"DEBUG: Axis {primary_axis}, Impact: {impact_idx}, Downswing: {downswing_dt:.3f}s, Fallback: {allow_fallback and (downswing_dt < 0.12 or downswing_dt > 0.6)}")
+    _log.debug("Axis %s, Impact: %d, Downswing: %.3fs, Fallback: %s", primary_axis, impact_idx, downswing_dt,
+               allow_fallback and (downswing_dt < 0.12 or downswing_dt > 0.6))
 
     if allow_fallback and (downswing_dt < 0.12 or downswing_dt > 0.6):
         a = max(start_idx + 1, 0)
         b = max(a + 1, min(len(gyro_mag_s) - 1, impact_idx - 1))
         if b > a:
-            rel_min = min(range(a, b), key=lambda i: gyro_mag_s[i])
-            top_idx = rel_min
-            print(f"DEBUG: Axis {primary_axis}, Fallback Top: {top_idx}")
+            top_idx = _argmin(gyro_mag_s, a, b)
+            _log.debug("Axis %s, Fallback Top: %d", primary_axis, top_idx)
             # recompute duration after fallback top
             downswing_dt = max(0.0, (impact_idx - top_idx) * dt)
 
@@ -237,65 +627,74 @@ def compute_tempo(samples: List[Dict], primary_axis: str = 'gyro_y',
     }
 
 
-def integrate_velocity(samples: List[Dict], dt: float) -> List[Tuple[float, float, float]]:
+def integrate_velocity(samples: Samples, dt: float) -> List[Tuple[float, float, float]]:
     """Legacy full-trace integration (kept for reference)."""
-    v = [(0.0, 0.0, 0.0)] * len(samples)
+    cols = samples_to_arrays(samples)
+    if not len(cols):
+        return []
+    v = [(0.0, 0.0, 0.0)]
+    append = v.append
     vx, vy, vz = 0.0, 0.0, 0.0
-    for i in range(1, len(samples)):
-        ax = samples[i]['accel_x']
-        ay = samples[i]['accel_y']
-        az = samples[i]['accel_z']
-        eff_ax, eff_ay, eff_az = ax, ay + 9.8, az
-        vx += eff_ax * dt
-        vy += eff_ay * dt
-        vz += eff_az * dt
-        v[i] = (vx, vy, vz)
+    # Walk the three columns in lockstep instead of indexing each one per step
+    for ax, ay, az in islice(zip(cols.ax, cols.ay, cols.az), 1, None):
+        vx += ax * dt
+        vy += (ay + 9.8) * dt
+        vz += az * dt
+        append((vx, vy, vz))
     return v
 
 
-def integrate_velocity_preimpact(samples: List[Dict], impact_idx: int, dt: float, pre_window_s: float = 0.06) -> Tuple[float, float, float]:
+@njit(cache=True, fastmath=True, nogil=True)
+def _preimpact_velocity(ax, ay_g, az, start, end, dt):
+    """Baseline-subtracted integration of ax/ay_g/az over [start, end]."""
+    ax0 = ax[start]
+    ay0 = ay_g[start]
+    az0 = az[start]
+    vx = vy = vz = 0.0
+    for i in range(start, end + 1):
+        vx += (ax[i] - ax0) * dt
+        vy += (ay_g[i] - ay0) * dt
+        vz += (az[i] - az0) * dt
+    return vx, vy, vz
+
+
+def integrate_velocity_preimpact(samples: Samples, impact_idx: int, dt: float,
+                                 pre_window_s: float = 0.06) -> Tuple[float, float, float]:
     """
     Integrate velocity over a short window that ENDS just BEFORE impact.
     We exclude the impact sample to avoid the large upward spike in accel_y
     that represents ball launch. Gravity is removed and the window is
     detrended to limit drift.
     """
-    n = len(samples)
+    cols = samples_to_arrays(samples)
     win_len = max(1, int(pre_window_s / max(dt, 1e-6)))
     start = max(0, impact_idx - win_len)
     end = max(0, impact_idx - 1)  # strictly pre-impact
 
-    if end < start:
+    if end < start or start >= len(cols):
         return (0.0, 0.0, 0.0)
 
     # Baseline-subtracted integration: remove the first sample value in the window
-    ax0 = samples[start]['accel_x']
-    ay0 = samples[start]['accel_y'] + 9.8
-    az0 = samples[start]['accel_z']
-
-    vx = vy = vz = 0.0
-    for i in range(start, end + 1):
-        eff_ax = samples[i]['accel_x'] - ax0
-        eff_ay = (samples[i]['accel_y'] + 9.8) - ay0
-        eff_az = samples[i]['accel_z'] - az0
-        vx += eff_ax * dt
-        vy += eff_ay * dt
-        vz += eff_az * dt
+    end = min(end, len(cols) - 1)
+    # Remove gravity over the window only rather than the whole trace
+    stop = end + 1
+    ay_g = array('d', [a + 9.8 for a in cols.ay[start:stop]])
+    return tuple(_preimpact_velocity(cols.ax[start:stop], ay_g, cols.az[start:stop], 0, end - start, dt))
 
-    return (vx, vy, vz)
 
-
-def calculate_club_speed_from_gyro_global(samples: List[Dict]) -> float:
+def calculate_club_speed_from_gyro_global(samples: Samples, gyro_mag: List[float] = None) -> float:
     """
     Estimate clubhead speed from global PEAK gyro magnitude (matches simulator targeting).
-    Returns speed in m/s.
-    """
-    omega = 0.0
-    for i in range(len(samples)):
-        gx, gy, gz = samples[i].get('gyro_x', 0.0), samples[i].get('gyro_y', 0.0), samples[i].get('gyro_z', 0.0)
-        m = math.sqrt(gx*gx + gy*gy + gz*gz)
-        if m > omega:
-            omega = m
+    Returns speed in m/s. gyro_mag (from compute_gyro_mag) is reused when given.
+    """
+    if gyro_mag is None:
+        # Only the peak is needed: reduce the magnitude stream without keeping it
+        cols = samples_to_arrays(samples)
+        return _club_speed_from_peak(max(map(math.hypot, cols.gx, cols.gy, cols.gz), default=0.0))
+    return _club_speed_from_peak(max(gyro_mag, default=0.0))
+
+
+def _club_speed_from_peak(omega: float) -> float:
     # Calibration: same mapping used by simulator targeting (GYRO_TO_KPH=1.5)
     kph = 1.5 * omega
     return kph / 3.6
@@ -309,7 +708,19 @@ def calculate_attack_angle(velocity_at_impact: Tuple[float, float, float]) -> fl
     return math.degrees(math.atan2(vy, horiz))
 
 
-def estimate_angles_from_preimpact_accel(samples: List[Dict], impact_idx: int, dt: float, pre_window_s: float = 0.06) -> Tuple[float, float]:
+@njit(cache=True, fastmath=True, nogil=True)
+def _preimpact_sum(ax, ay_g, az, start, end):
+    """Sums of ax, ay_g (gravity removed) and az over [start, end]."""
+    ax_sum = ay_sum = az_sum = 0.0
+    for i in range(start, end + 1):
+        ax_sum += ax[i]
+        ay_sum += ay_g[i]
+        az_sum += az[i]
+    return ax_sum, ay_sum, az_sum
+
+
+def estimate_angles_from_preimpact_accel(samples: Samples, impact_idx: int, dt: float,
+                                         pre_window_s: float = 0.06) -> Tuple[float, float]:
     """
     Estimate attack angle and club path using the MEAN dynamic acceleration
     vector in a short window BEFORE impact. This is more stable with our
@@ -320,7 +731,7 @@ def estimate_angles_from_preimpact_accel(samples: List[Dict], impact_idx: int, d
     - Attack = atan2(mean_ay, sqrt(mean_ax^2 + mean_az^2))
     - Path   = atan2(mean_ax, -mean_az)    # forward ~ -Z in simulator
     """
-    n = len(samples)
+    cols = samples_to_arrays(samples)
     win_len = max(3, int(pre_window_s / max(dt, 1e-6)))
     end = max(0, impact_idx - 2)
     start = max(0, end - win_len + 1)
@@ -328,17 +739,22 @@ def estimate_angles_from_preimpact_accel(samples: List[Dict], impact_idx: int, d
     if end < start:
         return 0.0, 0.0
 
-    ax_sum = ay_sum = az_sum = 0.0
-    count = 0
-    for i in range(start, end + 1):
-        ax_sum += samples[i]['accel_x']
-        ay_sum += samples[i]['accel_y'] + 9.8
-        az_sum += samples[i]['accel_z']
-        count += 1
-
-    if count == 0:
+    end = min(end, len(cols) - 1)
+    count = end - start + 1
+    if count <= 0:
         return 0.0, 0.0
 
+    # Remove gravity over the window only rather than the whole trace
+    stop = end + 1
+    ay_g = array('d', [a + 9.8 for a in cols.ay[start:stop]])
+    ax_sum, ay_sum, az_sum = _preimpact_sum(cols.ax[start:stop], ay_g, cols.az[start:stop], 0, count - 1)
+    return _angles_from_window_sums(ax_sum, ay_sum, az_sum, count)
+
+
+def _angles_from_window_sums(ax_sum: float, ay_sum: float, az_sum: float, count: int) -> Tuple[float, float]:
+    """Attack and path angles (degrees) from the window sums of ax, ay + 9.8 and az."""
+    if count <= 0:
+        return 0.0, 0.0
     mean_ax = ax_sum / count
     mean_ay = ay_sum / count
     mean_az = az_sum / count
@@ -348,6 +764,51 @@ def estimate_angles_from_preimpact_accel(samples: List[Dict], impact_idx: int, d
     path_deg = math.degrees(math.atan2(mean_ax, -mean_az))
     return attack_deg, path_deg
 
+
+@njit(cache=True, nogil=True)
+def _analyze_kernel(ax, ay, az, gx, gy, gz, t, pre_window_s):
+    """
+    analyze()'s numeric work in two passes instead of one per helper: a full
+    pass for dt (mean positive step between valid timestamps) and the first gyro
+    peak, then the pre-impact window for the gravity-removed accel sums.
+    Mirrors estimate_dt, find_impact_index and estimate_angles_from_preimpact_accel.
+    Returns (dt, impact_idx, omega, ax_sum, ay_sum, az_sum, count).
+    """
+    n = len(t)
+    dt_sum = 0.0
+    dt_count = 0
+    prev_t = math.nan
+    max_sq = -1.0
+    impact_idx = 0
+    for i in range(n):
+        ti = t[i]
+        if ti == ti:
+            if prev_t == prev_t and ti - prev_t > 0:
+                dt_sum += ti - prev_t
+                dt_count += 1
+            prev_t = ti
+        x = float(gx[i])
+        y = float(gy[i])
+        z = float(gz[i])
+        sq = x * x + y * y + z * z
+        if sq > max_sq:
+            max_sq = sq
+            impact_idx = i
+    dt = dt_sum / dt_count if dt_count > 0 else 0.01
+    omega = math.sqrt(max_sq) if n > 0 else 0.0
+
+    win_len = max(3, int(pre_window_s / max(dt, 1e-6)))
+    end = max(0, impact_idx - 2)
+    start = max(0, end - win_len + 1)
+    end = min(end, n - 1)
+    ax_sum = ay_sum = az_sum = 0.0
+    for i in range(start, end + 1):
+        ax_sum += float(ax[i])
+        ay_sum += float(ay[i]) + 9.8
+        az_sum += float(az[i])
+    return dt, impact_idx, omega, ax_sum, ay_sum, az_sum, end - start + 1
+
+
 def calculate_club_path_from_velocity(v_imp: Tuple[float, float, float]) -> float:
     """
     Club path = heading angle of the horizontal velocity vector at impact.
@@ -367,13 +828,23 @@ def approximate_launch_and_spin(club_speed_mps: float, attack_angle_deg: float)
     return launch_angle, spin_rpm
 
 
-def analyze(samples: List[Dict], club_length_m: float) -> Dict:
-    dt = estimate_dt(samples)
-    impact_idx = find_impact_index(samples)
-    # Angles from pre-impact mean acceleration (robust to spikes)
-    attack_angle_deg, club_path_deg = estimate_angles_from_preimpact_accel(samples, impact_idx, dt, pre_window_s=0.06)
-    # Speed from global peak gyro magnitude (calibrated to simulator)
-    club_speed_mps = calculate_club_speed_from_gyro_global(samples)
+def analyze(samples: Samples, club_length_m: float) -> Dict:
+    cols = samples_to_arrays(samples)
+    if HAVE_NUMBA:
+        # Fused compiled path: one pass for dt, impact and peak gyro, one over the pre-impact window
+        _, impact_idx, omega, ax_sum, ay_sum, az_sum, count = _analyze_kernel(
+            cols.ax, cols.ay, cols.az, cols.gx, cols.gy, cols.gz, cols.t, 0.06)
+        attack_angle_deg, club_path_deg = _angles_from_window_sums(ax_sum, ay_sum, az_sum, count)
+        club_speed_mps = _club_speed_from_peak(omega)
+    else:
+        dt = estimate_dt(cols)
+        # One magnitude pass shared by the impact search and the speed estimate
+        gyro_mag = compute_gyro_mag(cols)
+        impact_idx = find_impact_index(cols, gyro_mag)
+        # Angles from pre-impact mean acceleration over 60 ms (robust to spikes)
+        attack_angle_deg, club_path_deg = estimate_angles_from_preimpact_accel(cols, impact_idx, dt, 0.06)
+        # Speed from global peak gyro magnitude (calibrated to simulator)
+        club_speed_mps = calculate_club_speed_from_gyro_global(cols, gyro_mag)
     launch_angle_deg, spin_rpm = approximate_launch_and_spin(club_speed_mps, attack_angle_deg)
 
     return {
@@ -388,73 +859,193 @@ def analyze(samples: List[Dict], club_length_m: float) -> Dict:
     }
 
 
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _analysis_pool() -> ProcessPoolExecutor:
+    """
+    Process pool shared by multi-swing requests, started on first use and shut
+    down at exit. Workers come from a forkserver (spawn where unavailable) rather
+    than a fork of the server, whose request and refresh threads may hold locks.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            method = 'forkserver' if 'forkserver' in get_all_start_methods() else 'spawn'
+            _POOL = ProcessPoolExecutor(mp_context=get_context(method))
+            atexit.register(_POOL.shutdown, cancel_futures=True)
+        return _POOL
+
+
+def _analyze_batch(samples_list: List[Samples], club_length_m: float) -> List[Dict]:
+    return [analyze(samples, club_length_m) for samples in samples_list]
+
+
+def iter_swing_metrics(swings: Iterable[Dict], club_length_m: float = DEFAULT_CLUB_LENGTH_M,
+                       batch_size: int = 32) -> Iterator[Tuple[Dict, Dict]]:
+    """
+    Yield (swing, analyze() metrics) in input order.
+
+    Swings are analyzed in batches of batch_size on a process pool, keeping at
+    most two batches per core in flight so long files are still consumed
+    incrementally. On a single core, or when the input fits in a single batch,
+    swings are analyzed inline, where the pool round-trip would cost more than
+    it saves.
+    """
+    cpus = os.cpu_count() or 1
+    it = iter(swings)
+    batch = list(islice(it, batch_size))
+    if cpus <= 1 or len(batch) < batch_size:
+        for swing in chain(batch, it):
+            yield swing, analyze(swing.get('samples', []), club_length_m)
+        return
+
+    pool = _analysis_pool()
+    max_pending = 2 * cpus
+    pending = deque()
+    while batch:
+        samples_list = [swing.get('samples', []) for swing in batch]
+        pending.append((batch, pool.submit(_analyze_batch, samples_list, club_length_m)))
+        if len(pending) >= max_pending:
+            done, future = pending.popleft()
+            yield from zip(done, future.result())
+        batch = list(islice(it, batch_size))
+    while pending:
+        done, future = pending.popleft()
+        yield from zip(done, future.result())
+
+
 # -----------------------------
 # Swing segmentation utilities
 # -----------------------------
 
-def compute_gyro_mag(samples: List[Dict]) -> List[float]:
-    mags = []
-    for s in samples:
-        gx, gy, gz = s.get('gyro_x', 0.0), s.get('gyro_y', 0.0), s.get('gyro_z', 0.0)
-        mags.append(math.sqrt(gx*gx + gy*gy + gz*gz))
-    return mags
+def compute_gyro_mag(samples: Samples) -> List[float]:
+    cols = samples_to_arrays(samples)
+    return list(map(math.hypot, cols.gx, cols.gy, cols.gz))
+
+
+def _hysteresis_masks(cols: SampleArrays, start_threshold: float, end_threshold: float) -> Tuple[bytes, bytes]:
+    """
+    Per-sample byte masks (|w| >= start_threshold, |w| < end_threshold) for segment_swings.
+
+    Each gyro magnitude is bucketed against both thresholds as it is produced
+    (bisect over the two edges), so no magnitude list is materialized; the two
+    masks are then C-level byte translations of the bucket string.
+    """
+    if not math.isfinite(sum(cols.gx) + sum(cols.gy) + sum(cols.gz)):
+        # NaN/inf samples would land in the top bucket; compare them directly instead
+        mags = compute_gyro_mag(cols)
+        return bytes(map(start_threshold.__le__, mags)), bytes(map(end_threshold.__gt__, mags))
+    lo, hi = min(start_threshold, end_threshold), max(start_threshold, end_threshold)
+    # bucket 0: |w| < lo, 1: lo <= |w| < hi, 2: |w| >= hi
+    buckets = bytes(map(partial(bisect_right, (lo, hi)), map(math.hypot, cols.gx, cols.gy, cols.gz)))
+    if start_threshold >= end_threshold:
+        above, below = b'\x00\x00\x01', b'\x01\x00\x00'
+    else:
+        above, below = b'\x00\x01\x01', b'\x01\x01\x00'
+    return (buckets.translate(above + bytes(253)), buckets.translate(below + bytes(253)))
+
+
+@njit(cache=True, nogil=True)
+def _segment_bounds(gx, gy, gz, start_threshold, end_threshold, gap_len, bounds):
+    """
+    The segment_swings state machine fused with the magnitude computation, so no
+    magnitude column is materialized. Writes inclusive (start, end) index pairs
+    into bounds and returns the number of segments found.
+    """
+    n = len(gx)
+    count = 0
+    in_swing = False
+    start_idx = 0
+    below_end_count = 0
+    for i in range(n):
+        x = float(gx[i])
+        y = float(gy[i])
+        z = float(gz[i])
+        m = math.sqrt(x * x + y * y + z * z)
+        if not in_swing:
+            if m >= start_threshold:
+                in_swing = True
+                start_idx = i
+                below_end_count = 0
+        elif m < end_threshold:
+            below_end_count += 1
+            if below_end_count >= gap_len:
+                bounds[2 * count] = start_idx
+                bounds[2 * count + 1] = max(start_idx, i - gap_len + 1)
+                count += 1
+                in_swing = False
+                below_end_count = 0
+        else:
+            below_end_count = 0
+    if in_swing:
+        bounds[2 * count] = start_idx
+        bounds[2 * count + 1] = n - 1
+        count += 1
+    return count
 
 
 def segment_swings(
-    samples: List[Dict],
+    samples: Samples,
     dt: float,
     start_threshold: float = 25.0,
     end_threshold: float = 10.0,
     min_swing_duration_s: float = 0.3,
     min_gap_s: float = 0.2,
-) -> List[List[Dict]]:
+) -> List[Samples]:
     """
     Segment continuous IMU samples into individual swings using gyro magnitude hysteresis.
 
     - start when gyro |w| exceeds start_threshold
     - end when it falls below end_threshold and stays low for min_gap_s
     - discard segments shorter than min_swing_duration_s
+
+    Segments are slices of the input (lists of dicts, or SampleArrays).
     """
-    mags = compute_gyro_mag(samples)
     min_len = max(1, int(min_swing_duration_s / max(dt, 1e-6)))
     gap_len = max(1, int(min_gap_s / max(dt, 1e-6)))
 
-    swings = []
-    in_swing = False
-    start_idx = 0
-    below_end_count = 0
-
-    for i, m in enumerate(mags):
-        if not in_swing:
-            if m >= start_threshold:
-                in_swing = True
-                start_idx = i
-                below_end_count = 0
-        else:
-            if m < end_threshold:
-                below_end_count += 1
-                if below_end_count >= gap_len:
-                    end_idx = max(start_idx, i - gap_len + 1)
-                    segment = samples[start_idx:end_idx+1]
-                    if len(segment) >= min_len:
-                        swings.append(segment)
-                    in_swing = False
-                    below_end_count = 0
-            else:
-                below_end_count = 0
+    if HAVE_NUMBA:
+        # Single compiled pass over the gyro columns
+        cols = samples_to_arrays(samples)
+        # every closed segment spans at least 1 + gap_len samples
+        bounds = array('q', [0]) * (2 * (len(cols) // (gap_len + 1) + 1))
+        count = _segment_bounds(cols.gx, cols.gy, cols.gz,
+                                float(start_threshold), float(end_threshold), gap_len, bounds)
+        segments = (samples[bounds[2 * k]:bounds[2 * k + 1] + 1] for k in range(count))
+        return [seg for seg in segments if len(seg) >= min_len]
+
+    # One byte per sample, built at C speed; the loop below then only visits
+    # swing starts and the first run of gap_len quiet samples after each one.
+    above, below = _hysteresis_masks(samples_to_arrays(samples), float(start_threshold), float(end_threshold))
+    quiet = b'\x01' * gap_len
 
-    # Close trailing swing if ends near file end
-    if in_swing:
-        segment = samples[start_idx:]
+    swings = []
+    pos = 0
+    while True:
+        start_idx = above.find(1, pos)
+        if start_idx < 0:
+            break
+        end_run = below.find(quiet, start_idx + 1)
+        if end_run < 0:
+            # Close trailing swing if ends near file end
+            segment = samples[start_idx:]
+            if len(segment) >= min_len:
+                swings.append(segment)
+            break
+        segment = samples[start_idx:end_run + 1]
         if len(segment) >= min_len:
             swings.append(segment)
+        pos = end_run + gap_len
 
     return swings
 
 
 def load_flat_samples(path: str) -> List[Dict]:
-    with open(path, 'r') as f:
-        data = json.load(f)
+    """Per-sample records exactly as stored; segment_swings only builds columns to find the bounds."""
+    with open(path, 'rb') as f:
+        data = _loads(f.read())
     if not isinstance(data, list):
         raise ValueError('Expected a JSON array of sample objects')
     return data
@@ -470,46 +1061,186 @@ def write_swings(path: str, swings: List[List[Dict]]):
             },
             "samples": seg,
         })
-    with open(path, 'w') as f:
-        json.dump(out, f, indent=2)
+    with open(path, 'wb') as f:
+        f.write(_dumps(out, indent=True))
 
 
-def run_once() -> Dict:
-    # Defaults from your request: height 185 cm, weight 80 kg, 5-iron length ~38 inches (0.9652 m)
+def compute_payload() -> Dict:
+    """Metrics for the latest swing plus the player/club defaults (no side effects)."""
+    # Defaults from your request: height 185 cm, weight 80 kg, 5-iron length ~38 inches
     height_cm = 185
     weight_kg = 80
-    club_length_m = 0.9652
+    club_length_m = DEFAULT_CLUB_LENGTH_M
 
-    src = os.path.join(os.path.dirname(__file__), 'simulated_sensor_data.json')
-    samples = load_latest_swing(src)
-    metrics = analyze(samples, club_length_m)
+    src = default_data_path()
+    results = _results_for(src)
+    key = ('metrics', 'latest', club_length_m)
+    metrics = results.get(key)
+    if metrics is None:
+        metrics = results[key] = analyze(load_latest_swing(src), club_length_m)
 
     payload = {
-        "updatedAt": __import__('time').strftime('%Y-%m-%dT%H:%M:%S%z', __import__('time').localtime()),
+        "updatedAt": time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime()),
         "height_cm": height_cm,
         "weight_kg": weight_kg,
         "club_length_m": club_length_m,
         **metrics,
     }
+    return payload
+
 
-    # Save for the app to consume later if desired
-    out_path = os.path.join(os.path.dirname(__file__), 'latest_swing_stats.json')
-    with open(out_path, 'w') as f:
-        json.dump(payload, f, indent=2)
+def persist_payload(payload: Dict):
+    """Write payload to latest_swing_stats.json for the app to consume later."""
+    with open(_OUT_PATH, 'wb') as f:
+        f.write(_dumps(payload, indent=True))
 
+
+def run_once() -> Dict:
+    payload = compute_payload()
+    persist_payload(payload)
     return payload
 
 
+def _warmup_jit():
+    """
+    Call every numba kernel once on tiny inputs of the types requests use, so
+    compilation (or loading it from the on-disk cache) happens before the
+    server accepts connections instead of on the first request.
+    """
+    if not HAVE_NUMBA:
+        return
+    try:
+        one = array(SENSOR_TYPECODE, [0.0])
+        t = array('d', [0.0])
+        _preimpact_sum(one, t, one, 0, -1)
+        _preimpact_velocity(one, t, one, 0, 0, 0.01)
+        _analyze_kernel(one, one, one, one, one, one, t, 0.06)
+        _first_run_above(t, 0.0, 1)
+        _first_sign_change(t, 0)
+        _first_peak_above(t, 0.0, 0, 1)
+        _ema(t, 0.2, array('d', [0.0]))
+        _ema(one, 0.2, array('d', [0.0]))
+        _segment_bounds(one, one, one, 1.0, 0.5, 1, array('q', [0, 0]))
+    except Exception as e:
+        _log.warning("JIT warm-up failed, kernels will compile on first use: %s", e)
+
+
+# Tempo parameters in compute_tempo argument order (primary_axis, start_threshold_deg_s,
+# start_min_ms, impact_threshold_g, refractory_ms, allow_fallback, smoothing);
+# these are the HTTP query defaults.
+_TEMPO_DEFAULTS = ('gyro_y', 45.0, 100, 10.0, 25, True, 'ema')
+
+# Parameter sets the background refresher precomputes: the defaults, what the
+# app sends (golf-expo-app/src/config.js TEMPO_URL), and the most recently
+# requested ones, oldest first. Guarded by _CACHE_LOCK.
+_TEMPO_RECENT: Dict[Tuple, None] = dict.fromkeys([
+    _TEMPO_DEFAULTS,
+    ('gyro_y', 5.0, 100, 1.5, 25, True, 'ema'),
+])
+_TEMPO_RECENT_MAX = 4
+
+
+def _note_tempo_params(params: Tuple):
+    """Mark params as most recently requested, dropping the oldest set past _TEMPO_RECENT_MAX."""
+    with _CACHE_LOCK:
+        _TEMPO_RECENT.pop(params, None)
+        _TEMPO_RECENT[params] = None
+        while len(_TEMPO_RECENT) > _TEMPO_RECENT_MAX:
+            del _TEMPO_RECENT[next(iter(_TEMPO_RECENT))]
+
+
+def cached_tempo(results: Dict, idx: Union[int, str], swing: Dict, params: Tuple = _TEMPO_DEFAULTS) -> Dict:
+    """
+    compute_tempo for swing idx ('latest' for the last swing), memoized in
+    results (from _results_for) under params.
+    """
+    key = ('tempo', idx) + tuple(params)
+    tempo = results.get(key)
+    if tempo is None:
+        samples = swing.get('samples', [])
+        signals = None
+        if samples:
+            # Signals are shared by every parameter set that uses the same smoothing
+            smoothing = params[-1]
+            signals = results.get(('tempo-signals', idx, smoothing))
+            if signals is None:
+                signals = results[('tempo-signals', idx, smoothing)] = TempoSignals.build(samples, smoothing)
+        tempo = results[key] = compute_tempo(samples, *params, signals=signals)
+    return tempo
+
+
+def cached_latest_tempo(results: Dict, path: str, params: Tuple = _TEMPO_DEFAULTS) -> Dict:
+    """cached_tempo for the last swing in path; the file is only read on a cache miss."""
+    tempo = results.get(('tempo', 'latest') + tuple(params))
+    if tempo is None:
+        tempo = cached_tempo(results, 'latest', load_last_swing(path), params)
+    return tempo
+
+
+def _refresh_results(stop: threading.Event, interval_s: float = 0.25):
+    """
+    Background loop for serve(): whenever the data file's mtime or size changes,
+    recompute the latest metrics, all-metrics and tempo (for each parameter set
+    in _TEMPO_RECENT) for every swing into _results_for, so requests only
+    serialize the snapshot. Swings are streamed with iter_swings, so the full
+    list is not kept in the parse cache.
+    """
+    seen = None
+    last_error = None
+    while not stop.is_set():
+        try:
+            src = default_data_path()
+            version = (src,) + _file_version(src)
+            if version != seen:
+                # Recorded before computing: a file that fails is retried once it changes
+                seen = version
+                results = _results_for(src)
+                compute_payload()
+                with _CACHE_LOCK:
+                    param_sets = list(_TEMPO_RECENT)
+                key = ('all-metrics', DEFAULT_CLUB_LENGTH_M)
+                swings = iter_swings(src)
+                if key in results:
+                    pairs = ((swing, None) for swing in swings)
+                else:
+                    pairs = iter_swing_metrics(swings, DEFAULT_CLUB_LENGTH_M)
+                entries = []
+                swing = None
+                for idx, (swing, metrics) in enumerate(pairs):
+                    if metrics is not None:
+                        entries.append({"index": idx, "metadata": swing.get('metadata', {}), **metrics})
+                    for params in param_sets:
+                        cached_tempo(results, idx, swing, params)
+                if swing is None:
+                    raise ValueError("Expected a non-empty JSON array of swings")
+                results.setdefault(key, entries)
+                for params in param_sets:
+                    cached_tempo(results, 'latest', swing, params)
+            last_error = None
+        except Exception as e:
+            # Missing or half-written file: requests report the error; log it once
+            if str(e) != last_error:
+                _log.warning("Background refresh failed: %s", e)
+            last_error = str(e)
+        stop.wait(interval_s)
+
+
 def serve(host: str = '0.0.0.0', port: int = 5001):
-    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
     class Handler(BaseHTTPRequestHandler):
-        def _set_headers(self, status=200):
+        def _set_headers(self, status=200, gzipped=False):
             self.send_response(status)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
+            if gzipped:
+                self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Vary', 'Accept-Encoding')
             self.end_headers()
 
+        def _accepts_gzip(self):
+            return 'gzip' in self.headers.get('Accept-Encoding', '')
+
         def do_OPTIONS(self):
             self.send_response(200)
             self.send_header('Access-Control-Allow-Origin', '*')
@@ -529,62 +1260,91 @@ def serve(host: str = '0.0.0.0', port: int = 5001):
             refr_ms = int(qs.get('refractory_ms', [25])[0])
             primary = qs.get('axis', ['gyro_y'])[0]
             allow_fb = qs.get('fallback', ['1'])[0] == '1'
+            smoothing = qs.get('smoothing', ['ema'])[0]
+            tempo_params = (primary, start_thr, start_min, impact_thr_g, refr_ms, allow_fb, smoothing)
+            if path in ('/events', '/tempo', '/all-tempo'):
+                _note_tempo_params(tempo_params)
 
             if path == '/metrics':
                 try:
-                    payload = run_once()
+                    payload = compute_payload()
+                    if qs.get('persist', ['0'])[0] == '1':
+                        persist_payload(payload)
                     self._set_headers(200)
-                    self.wfile.write(json.dumps(payload).encode('utf-8'))
+                    self.wfile.write(_dumps(payload))
                 except Exception as e:
                     self._set_headers(500)
-                    self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
+                    self.wfile.write(_dumps({"error": str(e)}))
             elif path == '/all-metrics':
                 try:
-                    src = os.path.join(os.path.dirname(__file__), 'simulated_sensor_data.json')
-                    swings = load_all_swings(src)
-                    out = []
-                    for idx, swing in enumerate(swings):
-                        samples = swing.get('samples', [])
-                        metrics = analyze(samples, 0.9652)
-                        out.append({
+                    src = default_data_path()
+                    results = _results_for(src)
+                    cached = results.get(('all-metrics', DEFAULT_CLUB_LENGTH_M))
+                    if cached is None:
+                        # Parse and analyze the first batch before any header goes out, so a
+                        # bad file still gets a 500 with an error body
+                        all_metrics = iter_swing_metrics(iter_swings(src), DEFAULT_CLUB_LENGTH_M)
+                        first = next(all_metrics, None)
+                        if first is None:
+                            raise ValueError("Expected a non-empty JSON array of swings")
+                except Exception as e:
+                    self._set_headers(500)
+                    self.wfile.write(_dumps({"error": str(e)}))
+                    return
+                gzipped = self._accepts_gzip()
+                if cached is not None:
+                    body = _dumps(cached)
+                    self._set_headers(200, gzipped)
+                    self.wfile.write(gzip.compress(body, compresslevel=1) if gzipped else body)
+                    return
+                # Stream the array: swings are read and analyzed a batch at a time
+                # (see iter_swing_metrics) and each entry is sent as soon as it is ready
+                self._set_headers(200, gzipped)
+                gz = zlib.compressobj(1, zlib.DEFLATED, 31) if gzipped else None  # wbits=31: gzip framing
+
+                def send(data):
+                    self.wfile.write(gz.compress(data) if gz else data)
+
+                entries = []
+                try:
+                    send(b'[')
+                    for idx, (swing, metrics) in enumerate(chain((first,), all_metrics)):
+                        entry = {
                             "index": idx,
                             "metadata": swing.get('metadata', {}),
                             **metrics,
-                        })
-                    self._set_headers(200)
-                    self.wfile.write(json.dumps(out).encode('utf-8'))
+                        }
+                        entries.append(entry)
+                        if idx:
+                            send(b',')
+                        send(_dumps(entry))
+                    send(b']')
+                    if gz:
+                        self.wfile.write(gz.flush())
                 except Exception as e:
-                    self._set_headers(500)
-                    self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
+                    # The 200 is already out: reset the connection rather than end it
+                    # cleanly, so the client cannot mistake the partial body for a result
+                    _log.warning("/all-metrics aborted mid-stream: %s", e)
+                    self.close_connection = True
+                    self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+                    self.connection.close()
+                    return
+                results[('all-metrics', DEFAULT_CLUB_LENGTH_M)] = entries
             elif path == '/events':
                 try:
-                    src = os.path.join(os.path.dirname(__file__), 'simulated_sensor_data.json')
-                    swings = load_all_swings(src)
-                    swing = swings[-1]
-                    samples = swing.get('samples', [])
-                    tempo = compute_tempo(samples, primary_axis=primary,
-                                           start_threshold_deg_s=start_thr,
-                                           start_min_ms=start_min,
-                                           impact_threshold_g=impact_thr_g,
-                                           refractory_ms=refr_ms,
-                                           allow_fallback=allow_fb)
+                    src = default_data_path()
+                    results = _results_for(src)
+                    tempo = cached_latest_tempo(results, src, tempo_params)
                     self._set_headers(200)
-                    self.wfile.write(json.dumps(tempo).encode('utf-8'))
+                    self.wfile.write(_dumps(tempo))
                 except Exception as e:
                     self._set_headers(500)
-                    self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
+                    self.wfile.write(_dumps({"error": str(e)}))
             elif path == '/tempo':
                 try:
-                    src = os.path.join(os.path.dirname(__file__), 'simulated_sensor_data.json')
-                    swings = load_all_swings(src)
-                    swing = swings[-1]
-                    samples = swing.get('samples', [])
-                    tempo = compute_tempo(samples, primary_axis=primary,
-                                           start_threshold_deg_s=start_thr,
-                                           start_min_ms=start_min,
-                                           impact_threshold_g=impact_thr_g,
-                                           refractory_ms=refr_ms,
-                                           allow_fallback=allow_fb)
+                    src = default_data_path()
+                    results = _results_for(src)
+                    tempo = cached_latest_tempo(results, src, tempo_params)
                     # Only keep tempo fields for compact response
                     compact = {
                         'backswing_s': tempo['backswing_s'],
@@ -594,23 +1354,18 @@ def serve(host: str = '0.0.0.0', port: int = 5001):
                         'sampling_hz': tempo['sampling_hz'],
                     }
                     self._set_headers(200)
-                    self.wfile.write(json.dumps(compact).encode('utf-8'))
+                    self.wfile.write(_dumps(compact))
                 except Exception as e:
                     self._set_headers(500)
-                    self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
+                    self.wfile.write(_dumps({"error": str(e)}))
             elif path == '/all-tempo':
                 try:
-                    src = os.path.join(os.path.dirname(__file__), 'simulated_sensor_data.json')
+                    src = default_data_path()
+                    results = _results_for(src)
                     swings = load_all_swings(src)
                     out = []
                     for idx, swing in enumerate(swings):
-                        samples = swing.get('samples', [])
-                        tempo = compute_tempo(samples, primary_axis=primary,
-                                               start_threshold_deg_s=start_thr,
-                                               start_min_ms=start_min,
-                                               impact_threshold_g=impact_thr_g,
-                                               refractory_ms=refr_ms,
-                                               allow_fallback=allow_fb)
+                        tempo = cached_tempo(results, idx, swing, tempo_params)
                         out.append({
                             'index': idx,
                             'backswing_s': tempo['backswing_s'],
@@ -620,19 +1375,25 @@ def serve(host: str = '0.0.0.0', port: int = 5001):
                             'sampling_hz': tempo['sampling_hz'],
                             'metadata': swing.get('metadata', {}),
                         })
-                    self._set_headers(200)
-                    self.wfile.write(json.dumps(out).encode('utf-8'))
+                    body = _dumps(out)
+                    gzipped = self._accepts_gzip()
+                    if gzipped:
+                        body = gzip.compress(body, compresslevel=1)
+                    self._set_headers(200, gzipped)
+                    self.wfile.write(body)
                 except Exception as e:
                     self._set_headers(500)
-                    self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
+                    self.wfile.write(_dumps({"error": str(e)}))
             else:
                 self._set_headers(404)
-                self.wfile.write(json.dumps({"error": "Not found"}).encode('utf-8'))
+                self.wfile.write(_dumps({"error": "Not found"}))
 
-    httpd = HTTPServer((host, port), Handler)
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    _warmup_jit()
+    stop = threading.Event()
+    threading.Thread(target=_refresh_results, args=(stop,), daemon=True).start()
     print("Swing Analyzer server running:")
     try:
-        import socket
         local_ip = socket.gethostbyname(socket.gethostname())
     except Exception:
         local_ip = '127.0.0.1'
@@ -644,6 +1405,7 @@ def serve(host: str = '0.0.0.0', port: int = 5001):
     except KeyboardInterrupt:
         pass
     finally:
+        stop.set()
         httpd.server_close()
 
 
@@ -666,7 +1428,7 @@ def main():
         return
 
     payload = run_once()
-    print(json.dumps(payload, indent=2))
+    print(_dumps(payload, indent=True).decode('utf-8'))
 
 
 if __name__ == '__main__':